@@ -0,0 +1,162 @@
+import glob
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.special import ellipk
+from scipy.stats import t as t_student
+import perfilado
+from ciclos import tabla_de_archivo
+from limpieza import calidad_minima, corrida_limpia
+
+# Dependencia del período con la amplitud usando todas las corridas del TP.
+# En vez de comparar los archivos chico/mediano/grande, se toma cada ciclo de
+# cada corrida con su amplitud propia, se normaliza el período por el de
+# pequeñas oscilaciones T0 = 2π sqrt(L/g) (así se pueden juntar longitudes
+# distintas) y se agrupa por amplitud. Cada grupo se compara con la predicción
+# exacta T/T0 = (2/π) K(sin²(θ0/2)).
+
+g = 9.81
+
+# Longitudes (en m)
+length_values = {'L1': 0.305, 'L2': 0.215, 'L3': 0.27, 'L4': 0.205, 'L5': 0.115}
+
+# Ciclos con T/T0 fuera de este rango no son oscilaciones del péndulo (hasta
+# θ0 ≈ 1.6 rad el T/T0 exacto está entre 1 y 1.2)
+razon_min = 0.8
+razon_max = 1.3
+
+
+def periodo_teorico(theta0):
+    """T/T0 exacto del péndulo simple para amplitud θ0 (rad)."""
+    return 2 / np.pi * ellipk(np.sin(np.asarray(theta0) / 2) ** 2)
+
+
+def longitud_de_archivo(file):
+    """Longitud en m según el nombre del archivo (exp1_plat_L1_chico.txt -> L1)."""
+    m = re.search(r'_(L\d)_', file)
+    if m is None or m.group(1) not in length_values:
+        return None
+    return length_values[m.group(1)]
+
+
+@perfilado.medir('amplitud.ciclos')
+def juntar_ciclos(archivos=None):
+    """
+    DataFrame con un ciclo por fila (archivo, amplitud en rad, período, T/T0) de todas
+    las corridas, salteando las que no pasan la limpieza.
+    """
+    if archivos is None:
+        archivos = sorted(glob.glob('exp*_L*_*.txt'))
+
+    partes = []
+    for file in archivos:
+        L = longitud_de_archivo(file)
+        if L is None:
+            print(f"Sin longitud conocida para {file}, se omite")
+            continue
+        _, calidad = corrida_limpia(file)
+        if calidad['calidad'] < calidad_minima:
+            print(f"Calidad {calidad['calidad']:.2f} en {file}, se omite")
+            continue
+        tabla = tabla_de_archivo(file)
+        if len(tabla) == 0:
+            continue
+        tabla = tabla.sin_atipicos()
+        T0 = 2 * np.pi * np.sqrt(L / g)
+        partes.append(pd.DataFrame({
+            'archivo': file,
+            'amplitud': tabla.amplitud,
+            'periodo': tabla.periodo,
+            'razon': tabla.periodo / T0,
+        }))
+
+    if not partes:
+        return pd.DataFrame(columns=['archivo', 'amplitud', 'periodo', 'razon'])
+    ciclos = pd.concat(partes, ignore_index=True)
+    validos = ciclos['razon'].between(razon_min, razon_max)
+    return ciclos[validos].reset_index(drop=True)
+
+
+@perfilado.medir('amplitud.barrido')
+def barrido(archivos=None, bordes=None, n_bins=10, nivel=0.95):
+    """
+    Agrupa los ciclos por amplitud y calcula, por grupo, el T/T0 medio, su desvío,
+    el error del promedio y la banda de confianza (t de Student) junto con la teoría.
+    Devuelve (tabla por grupo, ciclos).
+    """
+    ciclos = juntar_ciclos(archivos)
+    amplitud = ciclos['amplitud'].to_numpy(dtype=float)
+    razon = ciclos['razon'].to_numpy(dtype=float)
+
+    if bordes is None:
+        bordes = np.linspace(0, amplitud.max() if len(amplitud) else 1.0, n_bins + 1)
+    bordes = np.asarray(bordes, dtype=float)
+    n_grupos = len(bordes) - 1
+
+    idx = np.digitize(amplitud, bordes) - 1
+    idx[amplitud == bordes[-1]] = n_grupos - 1  #el borde derecho entra en el último grupo
+    dentro = (idx >= 0) & (idx < n_grupos)
+    idx, amplitud, razon = idx[dentro], amplitud[dentro], razon[dentro]
+
+    n = np.bincount(idx, minlength=n_grupos)
+    suma_amp = np.bincount(idx, weights=amplitud, minlength=n_grupos)
+    suma = np.bincount(idx, weights=razon, minlength=n_grupos)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        amp_media = suma_amp / n
+        media = suma / n
+        #varianza muestral en dos pasadas (más estable que sumas de cuadrados)
+        desvios = razon - media[idx]
+        var = np.bincount(idx, weights=desvios ** 2, minlength=n_grupos) / (n - 1)
+        desvio = np.sqrt(var)
+        sem = desvio / np.sqrt(n)
+        semiancho = t_student.ppf((1 + nivel) / 2, n - 1) * sem
+
+    grupos = pd.DataFrame({
+        'amp_min': bordes[:-1],
+        'amp_max': bordes[1:],
+        'amplitud': amp_media,
+        'n': n,
+        'razon': media,
+        'desvio': desvio,
+        'sem': sem,
+        'ic_inf': media - semiancho,
+        'ic_sup': media + semiancho,
+        'teoria': periodo_teorico(amp_media),
+    })
+    return grupos[n > 0].reset_index(drop=True), ciclos
+
+
+def graficar_barrido(grupos, ciclos):
+    """Grafica T/T0 vs amplitud: ciclos, promedio por grupo con su banda y la predicción exacta."""
+    #pyplot se importa acá: servidor.py usa este módulo sin graficar
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 6))
+    plt.plot(ciclos['amplitud'], ciclos['razon'], '.', color='gray', alpha=0.3, label='Ciclos')
+    plt.fill_between(grupos['amplitud'], grupos['ic_inf'], grupos['ic_sup'],
+                     color='blue', alpha=0.2, label='Banda de confianza')
+    plt.plot(grupos['amplitud'], grupos['razon'], 'o-', color='blue', label='Promedio por grupo')
+
+    theta0 = np.linspace(0, max(ciclos['amplitud'].max(), 1e-3), 200)
+    plt.plot(theta0, periodo_teorico(theta0), 'r-', label='Teoría (integral elíptica)')
+
+    plt.xlabel('Amplitud θ0 (rad)')
+    plt.ylabel('T / T0')
+    plt.title('Período vs Amplitud (todas las corridas)')
+    plt.grid(True)
+    plt.legend()
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout()
+    plt.show()
+
+
+def main():
+    grupos, ciclos = barrido()
+    print(f"Ciclos usados: {len(ciclos)} de {ciclos['archivo'].nunique()} archivos")
+    print(grupos.to_string(index=False))
+    graficar_barrido(grupos, ciclos)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+import perfilado
+from remuestreo import corrida_uniforme
+
+# Segmentación de una corrida en ciclos. Se hace una sola vez por corrida y el
+# resultado es una tabla chica (una fila por ciclo) guardada como arrays
+# paralelos, así el período medio, el amortiguamiento o la relación
+# amplitud-período se calculan sobre la tabla sin volver a recorrer las muestras.
+
+# Ciclos cuyo período se aleja más que esta fracción de la mediana de su corrida
+# (un máximo perdido o un hueco que partió un ciclo) se consideran atípicos
+tolerancia_mediana = 0.15
+
+
+class TablaCiclos:
+    """
+    Tabla por ciclo (struct-of-arrays). Un ciclo va de un máximo de θ al siguiente.
+    Campos (un array por campo, todos del mismo largo):
+      inicio, fin   índices de las muestras que delimitan el ciclo
+      t_inicio      tiempo del máximo inicial
+      periodo       fin - inicio en tiempo (s)
+      amplitud      (máx - mín) / 2 dentro del ciclo, en las unidades de θ
+      energia       1 - cos(amplitud), proxy de E / (m g L) (θ en radianes)
+      omega_max     máximo de |ω| dentro del ciclo
+    """
+
+    campos = ['inicio', 'fin', 't_inicio', 'periodo', 'amplitud', 'energia', 'omega_max']
+
+    def __init__(self, inicio, fin, t_inicio, periodo, amplitud, energia, omega_max):
+        self.inicio = inicio
+        self.fin = fin
+        self.t_inicio = t_inicio
+        self.periodo = periodo
+        self.amplitud = amplitud
+        self.energia = energia
+        self.omega_max = omega_max
+
+    def __len__(self):
+        return len(self.periodo)
+
+    def periodo_medio(self):
+        """Promedio de los períodos, o None si no hay ciclos completos."""
+        if len(self) == 0:
+            return None
+        return np.mean(self.periodo)
+
+    def amortiguamiento(self):
+        """
+        Constante γ de A(t) = A0 exp(-γ t), ajustando log(amplitud) vs t_inicio.
+        Devuelve None si hay menos de dos ciclos.
+        """
+        validos = self.amplitud > 0
+        if np.count_nonzero(validos) < 2:
+            return None
+        pendiente, _ = np.polyfit(self.t_inicio[validos], np.log(self.amplitud[validos]), 1)
+        return -pendiente
+
+    def filtrar(self, mascara):
+        """Nueva tabla con los ciclos donde `mascara` es True."""
+        return TablaCiclos(*(getattr(self, campo)[mascara] for campo in self.campos))
+
+    def sin_atipicos(self, tolerancia=tolerancia_mediana):
+        """Nueva tabla sin los ciclos cuyo período se aleja de la mediana más que `tolerancia` (fracción)."""
+        if len(self) == 0:
+            return self
+        return self.filtrar(np.abs(self.periodo / np.median(self.periodo) - 1) <= tolerancia)
+
+    def a_dataframe(self):
+        return pd.DataFrame({campo: getattr(self, campo) for campo in self.campos})
+
+
+def _tabla_vacia():
+    vacio_i = np.empty(0, dtype=np.intp)
+    vacio_f = np.empty(0)
+    return TablaCiclos(vacio_i, vacio_i, vacio_f, vacio_f, vacio_f, vacio_f, vacio_f)
+
+
+@perfilado.medir('ciclos')
+def segmentar_ciclos(t, theta, omega=None, histeresis=0.15):
+    """
+    Segmenta θ(t) en ciclos de máximo a máximo. Para no cortar en los picos del
+    ruido, θ (centrado en su mediana) se divide en lóbulos por cruces por cero con
+    histéresis: un lóbulo positivo empieza cuando θ supera +h y termina cuando baja
+    de -h, con h = histeresis · (amplitud típica de la corrida). De cada lóbulo
+    positivo se toma un solo máximo, así entre dos máximos siempre hay un valle.
+    Los lóbulos cortados por el principio o el final de la corrida se descartan.
+    θ en radianes; si no se da ω se estima con np.gradient.
+    """
+    t = np.asarray(t, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    if len(theta) < 3:
+        return _tabla_vacia()
+
+    centrado = theta - np.nanmedian(theta)
+    p5, p95 = np.nanpercentile(centrado, [5, 95])
+    h = histeresis * (p95 - p5) / 2
+    if not h > 0:
+        return _tabla_vacia()
+
+    #estado +1 / -1 fuera de la banda [-h, h]; dentro de la banda se mantiene el último
+    signo = np.where(centrado > h, 1, np.where(centrado < -h, -1, 0))
+    ultimo = np.maximum.accumulate(np.where(signo != 0, np.arange(len(signo)), 0))
+    estado = signo[ultimo]
+
+    cambios = np.flatnonzero(np.diff(estado)) + 1
+    lobulo = np.zeros(len(estado), dtype=np.intp)
+    lobulo[cambios] = 1
+    lobulo = np.cumsum(lobulo)
+    primero, ultimo_lobulo = lobulo[0], lobulo[-1]
+
+    peaks, _ = find_peaks(theta)
+    peaks = peaks[(estado[peaks] == 1) & (lobulo[peaks] != primero) & (lobulo[peaks] != ultimo_lobulo)]
+    #el máximo más alto de cada lóbulo positivo
+    orden = np.lexsort((-theta[peaks], lobulo[peaks]))
+    _, primeros = np.unique(lobulo[peaks][orden], return_index=True)
+    peaks = np.sort(peaks[orden][primeros])
+    if len(peaks) < 2:
+        return _tabla_vacia()
+
+    if omega is None:
+        omega = np.gradient(theta, t)
+    omega = np.abs(np.asarray(omega, dtype=float))
+
+    #reduceat usa los segmentos [peaks[k], peaks[k+1]); el último llega hasta el final y se descarta
+    maximos = np.fmax.reduceat(theta, peaks)[:-1]
+    minimos = np.fmin.reduceat(theta, peaks)[:-1]
+    omega_max = np.fmax.reduceat(omega, peaks)[:-1]
+
+    inicio = peaks[:-1]
+    fin = peaks[1:]
+    amplitud = (maximos - minimos) / 2
+    #un ciclo que cruza un hueco sin datos (NaN) no tiene período confiable
+    completo = np.add.reduceat(np.isnan(theta), peaks)[:-1] == 0
+
+    tabla = TablaCiclos(inicio, fin, t[inicio], t[fin] - t[inicio],
+                        amplitud, 1 - np.cos(amplitud), omega_max)
+    return tabla if completo.all() else tabla.filtrar(completo)
+
+
+@lru_cache(maxsize=None)
+def tabla_de_archivo(file):
+    """
+    Tabla de ciclos de un archivo limpio y remuestreado a paso fijo (θ en radianes),
+    calculada una sola vez por archivo.
+    """
+    data = corrida_uniforme(file)
+    return segmentar_ciclos(data['t'].values, data['θ'].values)
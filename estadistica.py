@@ -0,0 +1,153 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Estadística de mediciones repetidas (p. ej. las pesadas de incertezas.py).
+# Para cada objeto se reporta promedio, desvío estándar muestral, error del
+# promedio (SEM) y la incerteza combinada con la resolución del instrumento.
+# Hay dos caminos con los mismos resultados:
+#   - AcumuladorWelford: se van agregando lecturas de a una o de a lotes, sin
+#     guardarlas (sirve para leer en vivo un archivo o un log del puerto serie),
+#   - estadisticas_lote: todos los objetos a la vez con NumPy.
+
+
+def incerteza_resolucion(resolucion):
+    """Incerteza tipo B de un instrumento digital: distribución uniforme de ancho `resolucion`."""
+    return resolucion / np.sqrt(12)
+
+
+class AcumuladorWelford:
+    """Promedio y varianza en una sola pasada (algoritmo de Welford)."""
+
+    def __init__(self, resolucion=0.0):
+        self.resolucion = resolucion
+        self.n = 0
+        self.media = np.nan  #sin lecturas no hay promedio (igual que estadisticas_lote)
+        self._m2 = 0.0  # suma de cuadrados de las desviaciones respecto de la media
+
+    def agregar(self, x):
+        if self.n == 0:
+            self.media = 0.0
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (x - self.media)
+
+    def agregar_lote(self, xs):
+        """Agrega un lote de lecturas combinándolo con lo acumulado (fórmula de Chan)."""
+        xs = np.asarray(xs, dtype=float)
+        if xs.size == 0:
+            return
+        n_b = xs.size
+        media_b = xs.mean()
+        m2_b = np.sum((xs - media_b) ** 2)
+        self._combinar(n_b, media_b, m2_b)
+
+    def unir(self, otro):
+        """Suma a este acumulador las lecturas de otro."""
+        self._combinar(otro.n, otro.media, otro._m2)
+
+    def _combinar(self, n_b, media_b, m2_b):
+        if n_b == 0:
+            return
+        if self.n == 0:
+            self.media = 0.0
+        n = self.n + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+
+    @property
+    def varianza(self):
+        """Varianza muestral (n - 1)."""
+        if self.n < 2:
+            return np.nan
+        return self._m2 / (self.n - 1)
+
+    @property
+    def desvio(self):
+        return np.sqrt(self.varianza)
+
+    @property
+    def sem(self):
+        """Error estándar del promedio."""
+        return self.desvio / np.sqrt(self.n) if self.n else np.nan
+
+    @property
+    def incerteza(self):
+        """
+        Incerteza combinada: SEM (tipo A) y resolución del instrumento (tipo B) en
+        cuadratura. Con menos de dos lecturas no hay SEM y queda solo la resolución.
+        """
+        sem = self.sem if self.n >= 2 else 0.0
+        return np.hypot(sem, incerteza_resolucion(self.resolucion))
+
+    def resultado(self):
+        return {'n': self.n, 'media': self.media, 'desvio': self.desvio,
+                'sem': self.sem, 'incerteza': self.incerteza}
+
+
+def _campos(linea):
+    """
+    Separa una línea de log en campos. Primero se parte por espacios, tabs o ';'.
+    Si queda un solo campo con comas, la coma es separador cuando hay más de una
+    o cuando ya hay un punto decimal ("12.5,72.41"); si no, es coma decimal ("72,41").
+    """
+    campos = [c for c in re.split(r'[\s;]+', linea.strip()) if c]
+    if len(campos) == 1 and ',' in campos[0]:
+        campo = campos[0]
+        if campo.count(',') > 1 or '.' in campo:
+            campos = [c for c in campo.split(',') if c]
+    return campos
+
+
+def leer_lecturas(ruta):
+    """
+    Generador de lecturas de un archivo de texto o log: una por línea, el último
+    campo (p. ej. "t valor" o "t,valor"). Acepta coma decimal; las líneas cuyo
+    último campo no es un número se ignoran.
+    """
+    with open(ruta, 'r') as f:
+        for linea in f:
+            campos = _campos(linea)
+            if not campos:
+                continue
+            try:
+                yield float(campos[-1].replace(',', '.'))
+            except ValueError:
+                continue
+
+
+def acumular_archivo(ruta, resolucion=0.0, acumulador=None):
+    """Agrega al acumulador (o a uno nuevo) todas las lecturas del archivo."""
+    if acumulador is None:
+        acumulador = AcumuladorWelford(resolucion)
+    for x in leer_lecturas(ruta):
+        acumulador.agregar(x)
+    return acumulador
+
+
+def estadisticas_lote(mediciones, resolucion=0.0):
+    """
+    Estadística de muchos objetos a la vez. `mediciones` es un dict objeto -> lecturas
+    (pueden tener distinta cantidad). Devuelve un DataFrame indexado por objeto con
+    n, media, desvio, sem e incerteza.
+    """
+    objetos = list(mediciones)
+    largo = max((len(v) for v in mediciones.values()), default=0)
+    tabla = np.full((len(objetos), largo), np.nan)
+    for i, objeto in enumerate(objetos):
+        tabla[i, :len(mediciones[objeto])] = mediciones[objeto]
+
+    n = np.count_nonzero(np.isfinite(tabla), axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.nansum(tabla, axis=1) / n
+        m2 = np.nansum((tabla - media[:, None]) ** 2, axis=1)
+        desvio = np.sqrt(np.where(n > 1, m2 / (n - 1), np.nan))
+        sem = desvio / np.sqrt(n)
+    incerteza = np.hypot(np.where(n > 1, sem, 0.0), incerteza_resolucion(resolucion))
+
+    return pd.DataFrame({'n': n, 'media': media, 'desvio': desvio,
+                         'sem': sem, 'incerteza': incerteza}, index=pd.Index(objetos, name='objeto'))
@@ -1,4 +1,4 @@
-import numpy as np
+from estadistica import estadisticas_lote
 
 # Aca vamos a "pesar" las bolitas y el carrito. vamos a pesar cada objeto 10 veces y 
 # sacar el promedio. Consideraremos la masa del objeto como la obtenida por el promedio de las 10 mediciones. 
@@ -15,10 +15,14 @@ mediciones = {
     'carrito' : [108.49, 108.54, 108.53, 108.54, 108.48, 108.54, 108.53, 108.54, 108.53, 108.54]
 }
 
+resolucion_balanza = 0.01  # gramos
+
 def prom_var():
-    for objeto, medicion in mediciones.items():
-        promedio = np.mean(medicion)
-        varianza = np.sqrt(np.var(medicion))
-        print(f"Promedio en (gramos) de {objeto}: {promedio}    Varianza: {varianza}")
+    """Imprime y devuelve promedio, desvío, error del promedio e incerteza combinada de cada objeto."""
+    resultados = estadisticas_lote(mediciones, resolucion_balanza)
+    for objeto, fila in resultados.iterrows():
+        print(f"Promedio en (gramos) de {objeto}: {fila['media']:.3f}    Desvío: {fila['desvio']:.3f}    "
+              f"Error del promedio: {fila['sem']:.3f}    Incerteza: {fila['incerteza']:.3f}")
+    return resultados
 
 prom_var()
\ No newline at end of file
@@ -0,0 +1,168 @@
+import io
+import mmap
+import re
+
+import numpy as np
+import pandas as pd
+import perfilado
+
+# Lector de exportaciones de Tracker para archivos muy grandes (capturas largas
+# a muchos fps). En lugar de leer todo el archivo a un str y pasarlo a pandas,
+# se mapea con mmap, se arma una sola vez el índice de comienzos de línea y
+# después se parsean solo las filas pedidas (por índice o por ventana de tiempo).
+# Las columnas son las mismas que en los load_data: t, x, y, θ, ω.
+
+COLUMNAS = ['t', 'x', 'y', 'θ', 'ω']
+
+# El índice se arma recorriendo el archivo de a bloques, para no crear un array
+# temporal del tamaño del archivo entero
+bloque_indice = 64 * 1024 * 1024
+
+#las filas del encabezado tienen letras ("mass A", "t x y θ ω"); las de datos solo
+#números, salvo la E de la notación científica
+_letra = re.compile(rb'[A-DF-Za-df-z]')
+
+
+class LectorTracker:
+    """
+    Acceso por filas a un archivo de Tracker mapeado en memoria. Supone, como
+    todos los archivos del TP, que t es creciente.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self._f = open(file, 'rb')
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            #archivo vacío: mmap no acepta largo 0
+            self._f.close()
+            raise ValueError(f"El archivo {file} está vacío")
+        self._coma = False
+        self._tab = False
+        self._indexar()
+
+    @perfilado.medir('mmap.indice')
+    def _indexar(self):
+        """Escanea el archivo una vez y guarda inicio/fin de cada fila de datos."""
+        vista = np.frombuffer(self._mm, dtype=np.uint8)  #vista sin copia sobre el mmap
+        largo = len(vista)
+        partes = []
+        for desde in range(0, largo, bloque_indice):
+            partes.append(np.flatnonzero(vista[desde:desde + bloque_indice] == ord('\n')) + desde)
+        saltos = np.concatenate(partes) if partes else np.empty(0, dtype=np.intp)
+
+        inicios = np.concatenate(([0], saltos + 1))
+        fines = np.concatenate((saltos, [largo]))
+        #fin de línea de Windows (el archivo mini es CRLF): el \r no es parte de la fila
+        con_cr = (fines > inicios) & (vista[np.maximum(fines - 1, 0)] == ord('\r'))
+        fines = fines - con_cr
+        del vista  #soltar el buffer para poder cerrar el mmap después
+        no_vacias = fines > inicios
+        inicios, fines = inicios[no_vacias], fines[no_vacias]
+
+        #saltear el encabezado; una fila de datos con t vacío cuenta como fila (con t NaN)
+        primera = 0
+        while primera < len(inicios) and _letra.search(self._mm[inicios[primera]:fines[primera]]):
+            primera += 1
+        self._inicios = inicios[primera:]
+        self._fines = fines[primera:]
+
+        if len(self._inicios):
+            primera_fila = self._mm[self._inicios[0]:self._fines[0]]
+            self._coma = b',' in primera_fila
+            #Tracker separa con tabs y deja el campo vacío cuando falta un valor;
+            #algunos archivos (el mini) vienen separados por espacios
+            self._tab = b'\t' in primera_fila
+
+    def __len__(self):
+        return len(self._inicios)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+        self._f.close()
+
+    def _primer_campo(self, inicio, fin):
+        #con tabs hay que partir por el tab: un t vacío deja la fila empezando con \t
+        campos = self._mm[inicio:fin].replace(b',', b'.').split(b'\t' if self._tab else None, 1)
+        try:
+            return float(campos[0])
+        except (IndexError, ValueError):
+            return np.nan
+
+    def tiempo(self, i):
+        """t de la fila i, parseando solo esa fila."""
+        return self._primer_campo(self._inicios[i], self._fines[i])
+
+    def buscar(self, t, derecha=False):
+        """
+        Índice de la primera fila con t_fila >= t (o > t si derecha=True),
+        por búsqueda binaria: parsea O(log n) filas. Las filas con t vacío se
+        saltean buscando la fila con tiempo más cercana dentro del intervalo.
+        """
+        antes = (lambda t_fila: t_fila <= t) if derecha else (lambda t_fila: t_fila < t)
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            j = mid
+            while j < hi and not np.isfinite(self.tiempo(j)):
+                j += 1
+            if j < hi:
+                if antes(self.tiempo(j)):
+                    lo = j + 1
+                else:
+                    hi = mid
+                continue
+            #de mid a hi no hay tiempos: se decide con la última fila con tiempo antes de mid
+            k = mid - 1
+            while k >= lo and not np.isfinite(self.tiempo(k)):
+                k -= 1
+            if k >= lo and antes(self.tiempo(k)):
+                lo = hi
+            else:
+                hi = k + 1 if k >= lo else lo
+        return lo
+
+    @perfilado.medir('mmap.filas')
+    def filas(self, inicio=0, fin=None, columnas=None):
+        """
+        Parsea las filas [inicio, fin) con una sola llamada a pd.read_csv sobre ese
+        tramo de bytes. Devuelve un dict columna -> array; los campos vacíos (p. ej.
+        ω en la primera fila) o que no son números quedan en NaN.
+        """
+        columnas = COLUMNAS if columnas is None else list(columnas)
+        fin = len(self) if fin is None else min(fin, len(self))
+        inicio = max(inicio, 0)
+        n = max(fin - inicio, 0)
+        if n == 0:
+            return {c: np.empty(0) for c in columnas}
+
+        tramo = self._mm[self._inicios[inicio]:self._fines[fin - 1]]
+        data = pd.read_csv(io.BytesIO(tramo), sep='\t' if self._tab else r'\s+', header=None,
+                           names=COLUMNAS, usecols=columnas, decimal=',' if self._coma else '.',
+                           index_col=False, skip_blank_lines=True)  #el índice tampoco tiene las líneas vacías
+        if len(data) != n:
+            raise ValueError(f"{self.file}: se esperaban {n} filas entre {inicio} y {fin} y se leyeron {len(data)}")
+        perfilado.anotar(filas=n)
+        return {c: pd.to_numeric(data[c], errors='coerce').to_numpy(dtype=float) for c in columnas}
+
+    def ventana(self, t_min=None, t_max=None, columnas=None):
+        """Filas con t_min <= t <= t_max (cualquiera de los dos puede ser None)."""
+        inicio = 0 if t_min is None else self.buscar(t_min)
+        fin = len(self) if t_max is None else self.buscar(t_max, derecha=True)
+        return self.filas(inicio, fin, columnas)
+
+
+def cargar_ventana(file, t_min=None, t_max=None, columnas=None):
+    """
+    Igual que leer el archivo con pd.read_csv, pero solo la ventana de tiempo pedida.
+    Devuelve un DataFrame con los valores crudos (sin corregir el offset de θ).
+    """
+    with LectorTracker(file) as lector:
+        return pd.DataFrame(lector.ventana(t_min, t_max, columnas))
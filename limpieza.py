@@ -0,0 +1,163 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import perfilado
+from lector_mmap import cargar_ventana
+
+# Limpieza de corridas exportadas de Tracker antes de segmentar o ajustar.
+# Se marcan, con tests vectorizados sobre toda la corrida:
+#   - filas sin tiempo (la fila huérfana del principio) y tiempos repetidos o que retroceden,
+#   - cuadros faltantes: un Δt de más de 1.5 pasos nominales deja cuadros sin dato,
+#   - campos de θ vacíos,
+#   - saltos de cuadro: un paso |Δθ| mucho más grande que el paso típico de la corrida,
+#   - aceleraciones angulares imposibles: |α| muy por encima de lo que tiene la corrida
+#     (o de alfa_max si se conoce el límite físico, p. ej. g/L).
+# Las muestras marcadas o vacías se interpolan si el hueco es corto y se descartan
+# si no. La calidad es la fracción de cuadros esperados (filas del archivo más
+# cuadros faltantes) que no hubo que tocar.
+
+calidad_minima = 0.8  # por debajo de esto la corrida no se usa en los análisis en lote
+
+
+def paso_nominal(t):
+    """
+    Paso entre cuadros de la cámara. La mediana de los Δt da el paso aproximado
+    (redondeado por Tracker); con ella se cuenta cuántos cuadros abarca cada Δt
+    y el paso final es el tiempo total dividido por la cantidad de cuadros, para
+    que la grilla no se corra a lo largo de la corrida.
+    """
+    dt = np.diff(np.asarray(t, dtype=float))
+    dt = dt[dt > 0]
+    if len(dt) == 0:
+        raise ValueError("Se necesitan al menos dos tiempos distintos para estimar el paso")
+    cuadros = np.maximum(np.rint(dt / np.median(dt)), 1)
+    return float(dt.sum() / cuadros.sum())
+
+
+def cargar_crudo(file):
+    """
+    Columnas t, θ, ω del archivo tal como vienen (sin dropna ni filtros), con θ
+    pasado a radianes respecto de la vertical. Todos los archivos del TP, incluido
+    el mini, tienen θ de Tracker entre -180° y 0°, así que alcanza con |θ| - 90.
+    """
+    data = cargar_ventana(file, columnas=['t', 'θ', 'ω'])
+    data['θ'] = np.deg2rad(np.abs(data['θ']) - 90)
+    data['ω'] = np.deg2rad(data['ω'])
+    return data
+
+
+def _escala_robusta(x):
+    """Desvío estimado con la mediana de las desviaciones absolutas (MAD)."""
+    return 1.4826 * np.median(np.abs(x - np.median(x)))
+
+
+def _largo_huecos(faltantes):
+    """Para cada muestra faltante, el largo del hueco (tramo de faltantes consecutivos) al que pertenece."""
+    bordes = np.diff(np.concatenate(([0], faltantes.astype(np.int8), [0])))
+    inicios = np.flatnonzero(bordes == 1)
+    fines = np.flatnonzero(bordes == -1)
+    largo = np.zeros(len(faltantes), dtype=np.intp)
+    largo[faltantes] = np.repeat(fines - inicios, fines - inicios)
+    return largo
+
+
+@perfilado.medir('limpieza')
+def limpiar_corrida(data, max_hueco=3, k_salto=6.0, k_aceleracion=8.0, alfa_max=None):
+    """
+    Limpia una corrida (DataFrame con 't' y 'θ', θ en radianes).
+    Devuelve (datos limpios, dict con la calidad y la cuenta de cada problema).
+    """
+    n_total = len(data)
+    t = pd.to_numeric(data['t'], errors='coerce').to_numpy(dtype=float)
+    theta = pd.to_numeric(data['θ'], errors='coerce').to_numpy(dtype=float)
+
+    #filas sin tiempo y tiempos que no avanzan respecto del máximo anterior
+    sin_t = ~np.isfinite(t)
+    t_max_previo = np.maximum.accumulate(np.where(sin_t, -np.inf, t))
+    repetidos = np.zeros(n_total, dtype=bool)
+    repetidos[1:] = ~sin_t[1:] & (t[1:] <= t_max_previo[:-1])
+    conservar = ~(sin_t | repetidos)
+    t, theta = t[conservar], theta[conservar]
+    limpio = data[conservar].copy()
+
+    #cuadros que la cámara debió tomar y no están (Δt > 1.5 pasos): se agregan vacíos
+    cuadros_faltantes = 0
+    if len(t) >= 2:
+        dt = paso_nominal(t)
+        if np.any(np.diff(t) > 1.5 * dt):
+            cuadro = np.rint((t - t[0]) / dt).astype(np.intp)
+            todos = np.arange(cuadro[-1] + 1)
+            nuevos = np.setdiff1d(todos, cuadro)
+            cuadros_faltantes = len(nuevos)
+            orden = np.argsort(np.concatenate((cuadro, nuevos)), kind='stable')
+            t = np.concatenate((t, t[0] + nuevos * dt))[orden]
+            theta = np.concatenate((theta, np.full(len(nuevos), np.nan)))[orden]
+            relleno = pd.DataFrame({c: np.nan for c in limpio.columns}, index=range(len(nuevos)))
+            limpio = pd.concat([limpio.reset_index(drop=True), relleno], ignore_index=True).iloc[orden]
+    n_esperados = n_total + cuadros_faltantes
+
+    faltantes = ~np.isfinite(theta)
+    validos = np.flatnonzero(~faltantes)
+
+    saltos = np.zeros(len(t), dtype=bool)
+    aceleraciones = np.zeros(len(t), dtype=bool)
+    if len(validos) >= 3:
+        tv, thv = t[validos], theta[validos]
+        paso = np.diff(thv)
+        #solo se comparan muestras vecinas: a través de un hueco el paso es grande sin ser un salto
+        contiguos = np.diff(validos) == 1
+        escala_paso = np.median(np.abs(paso[contiguos])) if contiguos.any() else 0
+        if escala_paso > 0:
+            saltos[validos[1:][contiguos & (np.abs(paso) > k_salto * escala_paso)]] = True
+
+        #α por diferencias finitas con el dt real de cada muestra
+        dt = np.diff(tv)
+        velocidad = paso / dt
+        alfa = 2 * np.diff(velocidad) / (dt[:-1] + dt[1:])
+        vecinos = contiguos[:-1] & contiguos[1:]
+        limite = alfa_max
+        if limite is None:
+            limite = k_aceleracion * _escala_robusta(alfa[vecinos]) if vecinos.any() else 0
+        if limite > 0:
+            aceleraciones[validos[1:-1][vecinos & (np.abs(alfa) > limite)]] = True
+
+    marcados = saltos | aceleraciones
+    huecos = faltantes | marcados
+    largo = _largo_huecos(huecos)
+    interpolables = huecos & (largo <= max_hueco)
+    descartados = huecos & ~interpolables
+
+    buenos = ~huecos
+    theta_limpio = theta.copy()
+    if np.count_nonzero(buenos) >= 2:
+        theta_limpio[interpolables] = np.interp(t[interpolables], t[buenos], theta[buenos])
+    else:
+        #sin dos muestras buenas no hay con qué interpolar: todos los huecos se descartan
+        interpolables = np.zeros(len(t), dtype=bool)
+        descartados = huecos
+
+    limpio = limpio.reset_index(drop=True)
+    limpio['t'] = t
+    limpio['θ'] = theta_limpio
+    limpio = limpio[~descartados]
+
+    tocadas = n_esperados - len(t) + np.count_nonzero(huecos)
+    calidad = {
+        'calidad': float(1 - tocadas / n_esperados) if n_esperados else 0.0,
+        'sin_tiempo': int(np.count_nonzero(sin_t)),
+        'repetidos': int(np.count_nonzero(repetidos)),
+        'cuadros_faltantes': cuadros_faltantes,
+        'faltantes': int(np.count_nonzero(faltantes)),
+        'saltos': int(np.count_nonzero(saltos)),
+        'aceleraciones': int(np.count_nonzero(aceleraciones)),
+        'interpolados': int(np.count_nonzero(interpolables)),
+        'descartados': int(np.count_nonzero(descartados)),
+    }
+    return limpio, calidad
+
+
+@lru_cache(maxsize=None)
+def corrida_limpia(file):
+    """Carga el archivo crudo y lo limpia, una sola vez por archivo. Devuelve (datos, calidad)."""
+    return limpiar_corrida(cargar_crudo(file))
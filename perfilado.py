@@ -0,0 +1,216 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Instrumentación opcional por etapa (carga, período, ajuste, gráficos).
+# Por defecto está apagada: los decoradores solo chequean una bandera y llaman
+# a la función original. Se activa con PERFILADO=1 o llamando a activar().
+# Con PERFILADO_MEMORIA=1 también se mide el pico de memoria con tracemalloc.
+# Al salir se imprime la tabla resumen y, con PERFILADO_SALIDA=<base>, se exportan
+# <base>.json y <base>.trace.json.
+
+_activo = False
+_memoria = False
+_lock = threading.Lock()
+_local = threading.local()
+_origen = time.perf_counter()
+
+_estadisticas = {}
+_eventos = []
+
+
+def activar(memoria=False, salida=None):
+    """
+    Activa la instrumentación. Si se da `salida`, al terminar imprime la tabla y,
+    si no es vacía, exporta el resumen y el trace usando `salida` como base del nombre.
+    """
+    global _activo, _memoria
+    _activo = True
+    _memoria = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if salida is not None:
+        atexit.register(_reporte_al_salir, salida)
+
+
+def desactivar():
+    """Apaga la instrumentación (los datos ya registrados se conservan)."""
+    global _activo, _memoria
+    _activo = False
+    if _memoria and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _memoria = False
+
+
+def activo():
+    return _activo
+
+
+def reiniciar():
+    """Borra las estadísticas y eventos registrados."""
+    with _lock:
+        _estadisticas.clear()
+        _eventos.clear()
+
+
+def _pila():
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+@contextmanager
+def etapa(nombre):
+    """Mide el bloque como una etapa con nombre. No hace nada si está apagado."""
+    if not _activo:
+        yield
+        return
+
+    pila = _pila()
+    marco = {'nombre': nombre, 'extra': {}, 'mem0': 0, 'pico': 0}
+    if _memoria:
+        #el pico se reinicia por etapa; se propaga al padre para no perderlo
+        actual, pico = tracemalloc.get_traced_memory()
+        if pila:
+            pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+        tracemalloc.reset_peak()
+        marco['mem0'] = actual
+    pila.append(marco)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fin = time.perf_counter()
+        pila.pop()
+        memoria = None
+        if _memoria:
+            _, pico = tracemalloc.get_traced_memory()
+            pico = max(marco['pico'], pico)
+            memoria = max(pico - marco['mem0'], 0)
+            if pila:
+                pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+        _registrar(nombre, inicio, fin, marco['extra'], memoria)
+
+
+def anotar(**valores):
+    """Suma contadores (p. ej. filas=..., nfev=...) a la etapa en curso."""
+    if not _activo:
+        return
+    pila = _pila()
+    if not pila:
+        return
+    extra = pila[-1]['extra']
+    for clave, valor in valores.items():
+        extra[clave] = extra.get(clave, 0) + valor
+
+
+def _filas(objeto):
+    """Cantidad de filas si el objeto es un DataFrame/array, None si no."""
+    if getattr(objeto, 'ndim', 0) >= 1:
+        return len(objeto)
+    return None
+
+
+def medir(nombre):
+    """Decorador que registra cada llamada a la función como la etapa `nombre`."""
+    def decorador(func):
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return func(*args, **kwargs)
+            with etapa(nombre):
+                resultado = func(*args, **kwargs)
+                extra = _pila()[-1]['extra']
+                if 'filas' not in extra:
+                    #si la función no anotó filas, se usan las del resultado o del primer argumento
+                    filas = _filas(resultado)
+                    if filas is None and args:
+                        filas = _filas(args[0])
+                    if filas is not None:
+                        extra['filas'] = filas
+            return resultado
+        return envoltura
+    return decorador
+
+
+def _registrar(nombre, inicio, fin, extra, memoria):
+    duracion = fin - inicio
+    with _lock:
+        est = _estadisticas.get(nombre)
+        if est is None:
+            est = _estadisticas[nombre] = {'llamadas': 0, 'tiempo': 0.0, 'max': 0.0,
+                                           'filas': 0, 'nfev': 0, 'memoria': 0}
+        est['llamadas'] += 1
+        est['tiempo'] += duracion
+        est['max'] = max(est['max'], duracion)
+        est['filas'] += extra.get('filas', 0)
+        est['nfev'] += extra.get('nfev', 0)
+        if memoria is not None:
+            est['memoria'] = max(est['memoria'], memoria)
+
+        args = dict(extra)
+        if memoria is not None:
+            args['memoria'] = memoria
+        _eventos.append({
+            'name': nombre,
+            'ph': 'X',
+            'ts': (inicio - _origen) * 1e6,
+            'dur': duracion * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+
+def resumen():
+    """Devuelve una lista de filas (una por etapa) ordenada por tiempo total."""
+    with _lock:
+        filas = [dict(etapa=nombre, **est) for nombre, est in _estadisticas.items()]
+    for fila in filas:
+        fila['promedio'] = fila['tiempo'] / fila['llamadas']
+    return sorted(filas, key=lambda fila: fila['tiempo'], reverse=True)
+
+
+def tabla():
+    """Resumen como texto, listo para imprimir."""
+    encabezado = f"{'Etapa':<24}{'Llamadas':>10}{'Total (s)':>12}{'Prom (ms)':>12}{'Max (ms)':>12}{'Filas':>10}{'nfev':>8}{'Mem (KiB)':>11}"
+    lineas = [encabezado, '-' * len(encabezado)]
+    for fila in resumen():
+        lineas.append(f"{fila['etapa']:<24}{fila['llamadas']:>10}{fila['tiempo']:>12.4f}"
+                      f"{fila['promedio'] * 1e3:>12.3f}{fila['max'] * 1e3:>12.3f}"
+                      f"{fila['filas']:>10}{fila['nfev']:>8}{fila['memoria'] / 1024:>11.1f}")
+    return '\n'.join(lineas)
+
+
+def exportar_json(ruta):
+    """Guarda el resumen por etapa en JSON."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(resumen(), f, ensure_ascii=False, indent=2)
+
+
+def exportar_chrome(ruta):
+    """Guarda los eventos en formato Chrome trace (chrome://tracing, Perfetto)."""
+    with _lock:
+        eventos = list(_eventos)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+def _reporte_al_salir(base):
+    if not _estadisticas:
+        return
+    print(tabla())
+    if base:
+        exportar_json(f'{base}.json')
+        exportar_chrome(f'{base}.trace.json')
+
+
+if os.environ.get('PERFILADO', '') not in ('', '0'):
+    activar(memoria=os.environ.get('PERFILADO_MEMORIA', '') not in ('', '0'),
+            salida=os.environ.get('PERFILADO_SALIDA', ''))
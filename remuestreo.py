@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline
+import perfilado
+from limpieza import corrida_limpia, paso_nominal
+
+# Regularización de los tiempos de una corrida. Tracker exporta t con jitter de
+# redondeo (0.033 / 0.034 s) y, después del dropna o de la limpieza, con cuadros
+# faltantes. Acá se detecta el paso nominal, se llevan los tiempos a la grilla
+# t0 + k·dt y se interpolan las columnas sobre la grilla completa. Con paso fijo,
+# una ventana de N muestras (p. ej. el rolling(window=5)) es siempre la misma
+# cantidad de segundos, y se pueden apilar corridas o usar FFT directamente.
+
+
+@perfilado.medir('remuestreo')
+def regularizar(data, columnas=('θ',), metodo='lineal', dt=None, max_hueco=3):
+    """
+    Lleva las columnas pedidas de `data` a una grilla uniforme de paso dt (por
+    defecto el nominal). metodo: 'lineal' o 'cubico'. Solo se completan huecos de
+    hasta `max_hueco` cuadros (el mismo criterio que la limpieza); los cuadros de
+    huecos más largos quedan en NaN, para no unir con una recta media oscilación.
+    Devuelve un DataFrame con t, las columnas y 'interpolado' (True en los cuadros
+    completados).
+    """
+    columnas = list(columnas)
+    t = pd.to_numeric(data['t'], errors='coerce').to_numpy(dtype=float)
+    valores = np.column_stack([pd.to_numeric(data[c], errors='coerce').to_numpy(dtype=float)
+                               for c in columnas])
+    completas = np.isfinite(t) & np.isfinite(valores).all(axis=1)
+    t, valores = t[completas], valores[completas]
+    if len(t) < 2:
+        raise ValueError("La corrida no tiene suficientes muestras para remuestrear")
+
+    if dt is None:
+        dt = paso_nominal(t)
+
+    #cada muestra va al cuadro más cercano; si dos caen en el mismo, queda la primera
+    t0 = t[0]
+    cuadro = np.rint((t - t0) / dt).astype(np.intp)
+    cuadro, primeros = np.unique(cuadro, return_index=True)
+    valores = valores[primeros]
+    t_cuadro = t0 + cuadro * dt
+
+    grilla_k = np.arange(cuadro[-1] + 1)
+    grilla = t0 + grilla_k * dt
+
+    #largo del hueco entre los dos cuadros con dato que rodean a cada cuadro de la grilla
+    der = np.clip(np.searchsorted(cuadro, grilla_k), 1, len(cuadro) - 1)
+    izq = der - 1
+    hueco = cuadro[der] - cuadro[izq] - 1
+
+    if metodo == 'lineal':
+        #un solo searchsorted y los mismos pesos para todas las columnas
+        peso = ((grilla_k - cuadro[izq]) / (cuadro[der] - cuadro[izq]))[:, None]
+        nuevos = valores[izq] * (1 - peso) + valores[der] * peso
+    elif metodo == 'cubico':
+        nuevos = CubicSpline(t_cuadro, valores, axis=0)(grilla)
+    else:
+        raise ValueError(f"Método de interpolación desconocido: {metodo}")
+
+    interpolado = np.ones(len(grilla), dtype=bool)
+    interpolado[cuadro] = False
+    largo = interpolado & (hueco > max_hueco)
+    nuevos[largo] = np.nan
+    interpolado &= ~largo
+
+    resultado = pd.DataFrame(nuevos, columns=columnas)
+    resultado.insert(0, 't', grilla)
+    resultado['interpolado'] = interpolado
+    resultado.attrs['dt'] = dt
+    return resultado
+
+
+@lru_cache(maxsize=None)
+def corrida_uniforme(file, metodo='lineal'):
+    """Corrida limpia y remuestreada a paso fijo, calculada una sola vez por archivo y método."""
+    data, _ = corrida_limpia(file)
+    return regularizar(data, metodo=metodo)
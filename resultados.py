@@ -1,8 +1,9 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.signal import find_peaks
 from scipy.stats import linregress
+import perfilado
+from ciclos import segmentar_ciclos
 
 # FALTAN DOS LONGITUDES, LA DE L1 Y L2 QUE TODAVIA NO ESTÁN EN EL DRIVE
 mass = 22.06  
@@ -11,10 +12,12 @@ lengths = ['L3', 'L4', 'L5']
 length_values = {'L3': 0.27, 'L4': 0.205, 'L5': 0.115}
 g = 9.81
 
+@perfilado.medir('carga')
 def load_data(amplitude, length):
     """Lee y limpia los datos del archivo para la combinación de amplitud y longitud."""
     file = f'exp2_{length}_{amplitude}.txt'
-    data = pd.read_csv(file, sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
+    with perfilado.etapa('carga.parseo'):
+        data = pd.read_csv(file, sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
     data_clean = data.dropna(subset=['θ'])
     data_clean.loc[:, 't'] = pd.to_numeric(data_clean['t'], errors='coerce')
     data_clean.loc[:, 'θ'] = pd.to_numeric(data_clean['θ'], errors='coerce')
@@ -42,20 +45,15 @@ def graficar_trayectorias():
             k += 1  # Avanza al siguiente subplot
 
     fig.suptitle('Trayectoria del péndulo (θ vs t) para diferentes longitudes y amplitudes', fontsize=16)
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.show()
 
+@perfilado.medir('periodo')
 def calcular_periodo(data):
     """Calcula el período usando los máximos locales del ángulo θ."""
-    t = data['t'].values
-    theta = data['θ'].values
-    
-    peaks, _ = find_peaks(theta)
-    tiempos_entre_picos = np.diff(t[peaks])
-    
-    periodo = np.mean(tiempos_entre_picos)
-    
-    return periodo
+    ciclos = segmentar_ciclos(data['t'].values, np.deg2rad(data['θ'].values))
+    return ciclos.periodo_medio()
 
 def calcular_frecuencia(data):
     """Calcula la frecuencia a partir del período."""
@@ -80,7 +78,8 @@ def graficar_frecuencia_vs_longitud_calculada():
         axs[i].grid(True)
 
     fig.suptitle(f'Frecuencia de Oscilación ω vs Longitud - Masa fija {mass} kg')
-    plt.tight_layout(rect=[0, 0, 1, 0.95])  
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.show()
 
 def graficar_frecuencia_vs_masa():
@@ -101,7 +100,8 @@ def graficar_frecuencia_vs_masa():
         axs[i].grid(True)
 
     fig.suptitle(f'Frecuencia de Oscilación ω vs Masa - Longitud fija para tres casos')
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.show()
 
 def graficar_periodo_vs_longitud():
@@ -126,7 +126,8 @@ def graficar_periodo_vs_longitud():
     plt.title('Relación entre $T^2$ y Longitud')
     plt.grid(True)
     plt.legend()
-    plt.tight_layout()
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout()
     plt.show()
     print(f"Gravedad calculada a partir del ajuste: {gravedad_calculada:.2f} m/s^2")
 
@@ -1,6 +1,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from io import StringIO
+import perfilado
 
 masses = ['mar', 'plat', 'dor']
 amplitudes = ['chico', 'mediano', 'grande']  
@@ -8,14 +9,17 @@ lengths = ['L1', 'L2']
 length_values = {'L1': 0.305, 'L2': 0.215}
 g = 9.81
 
+@perfilado.medir('carga')
 def load_data(mass, amplitude, length):
     """Lee y limpia los datos del archivo para la combinación de masa, amplitud y longitud."""
     file = f'exp1_{mass}_{length}_{amplitude}.txt'
     
-    with open(file, 'r') as f:
-        file_data = f.read().replace(',', '.')
+    with perfilado.etapa('carga.lectura'):
+        with open(file, 'r') as f:
+            file_data = f.read().replace(',', '.')
     
-    data = pd.read_csv(StringIO(file_data), sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
+    with perfilado.etapa('carga.parseo'):
+        data = pd.read_csv(StringIO(file_data), sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
 
     data['t'] = pd.to_numeric(data['t'], errors='coerce')
     data['x'] = pd.to_numeric(data['x'], errors='coerce')
@@ -50,7 +54,8 @@ def plot_trajectory():
     fig1.suptitle('Theta vs Time for L1')
     fig2.suptitle('Theta vs Time for L2')
     
-    plt.tight_layout()
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout()
     plt.show()
 
 def main():
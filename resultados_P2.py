@@ -1,8 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from scipy.signal import find_peaks
 from io import StringIO
+import perfilado
+from ciclos import segmentar_ciclos
 
 # Valores de las masas
 M1 = 22.06  # plateada
@@ -42,11 +43,13 @@ mass_colors = {
     M3: 'green'    # M3 - madera
 }
 
+@perfilado.medir('carga')
 def load_data(amplitude, length):
     """Lee y limpia los datos del archivo para la combinación de amplitud y longitud."""
     file = f'exp2_{length}_{amplitude}.txt'
     
-    data = pd.read_csv(file, sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
+    with perfilado.etapa('carga.parseo'):
+        data = pd.read_csv(file, sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
     
     data_clean = data.dropna(subset=['θ']).copy()  # .copy() para evitar advertencias
     data_clean['t'] = pd.to_numeric(data_clean['t'], errors='coerce')
@@ -56,14 +59,17 @@ def load_data(amplitude, length):
     
     return data_clean
 
+@perfilado.medir('carga')
 def load_data_L1_L2(amplitude, length):
     """Lee y limpia los datos del archivo para la combinación de masa, amplitud y longitud."""
     file = f'exp1_plat_{length}_{amplitude}.txt'
     
-    with open(file, 'r') as f:
-        file_data = f.read().replace(',', '.')
+    with perfilado.etapa('carga.lectura'):
+        with open(file, 'r') as f:
+            file_data = f.read().replace(',', '.')
     
-    data = pd.read_csv(StringIO(file_data), sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
+    with perfilado.etapa('carga.parseo'):
+        data = pd.read_csv(StringIO(file_data), sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
 
     data['t'] = pd.to_numeric(data['t'], errors='coerce')
     data['x'] = pd.to_numeric(data['x'], errors='coerce')
@@ -76,15 +82,11 @@ def load_data_L1_L2(amplitude, length):
     
     return data_clean
 
+@perfilado.medir('periodo')
 def calcular_periodo(data):
     """Calcula el periodo de oscilación usando detección de picos en θ vs. t."""
-    peaks, _ = find_peaks(data['θ'])
-    peak_times = data['t'].iloc[peaks]
-    if len(peak_times) > 1:
-        periods = np.diff(peak_times)
-        return np.mean(periods) 
-    else:
-        return None
+    ciclos = segmentar_ciclos(data['t'].values, np.deg2rad(data['θ'].values))
+    return ciclos.periodo_medio()
 
 def calcular_frecuencia(data):
     """Calcula la frecuencia a partir del período."""
@@ -135,7 +137,8 @@ def graficar_frecuencia_vs_longitud_calculada():
         axs[i].legend(handles, labels, loc='upper right', title="Longitud")
 
     fig.suptitle(f'Frecuencia de Oscilación ω vs Longitud - Masa {M1} g ± {mass_uncertainty} g')
-    plt.tight_layout(rect=[0, 0, 1, 0.95])  
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.show()
 
 def graficar_frecuencia_vs_masa():
@@ -171,7 +174,8 @@ def graficar_frecuencia_vs_masa():
         axs[i].legend(handles, labels, loc='upper right', title="Masa")
 
     fig.suptitle(f'Frecuencia de Oscilación ω vs Masa (M1={M1} g, M2={M2} g, M3={M3} g)')
-    plt.tight_layout(rect=[0, 0, 1, 0.95])  
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.show()
 
 def main():
@@ -1,9 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-from io import StringIO
 from scipy.optimize import curve_fit
 import numpy as np
 from scipy.signal import find_peaks
+import perfilado
+from limpieza import calidad_minima, cargar_crudo, limpiar_corrida
 
 g = 9.81
 L = 0.305
@@ -16,37 +17,22 @@ files = [
     "exp3_plat_L1_mini.txt"
 ]
 
+@perfilado.medir('carga')
 def load_data(file):
-    """Lee y limpia los datos del archivo, con manejo especial para el archivo mini."""
-    with open(file, 'r') as f:
-        file_data = f.read().replace(',', '.') 
-
-    data = pd.read_csv(StringIO(file_data), sep='\s+', skiprows=1, names=['t', 'x', 'y', 'θ', 'ω'])
-    
-    data['t'] = pd.to_numeric(data['t'], errors='coerce')
-    data['θ'] = pd.to_numeric(data['θ'], errors='coerce')
-    
-    if 'mini' in file:
-        #si es el archivo mini, corregir el offset y filtrar los datos
-        data['θ'] = data['θ'] + 90
-        data['θ'] = np.deg2rad(data['θ'])
-        
-        window_size = 5
-        data['θ'] = data['θ'].rolling(window=window_size, center=True).median()
-        
-        #eliminar los NaNs
-        data = data.dropna(subset=['θ'])
-    else:
-        #resto de los archivos
-        data['θ'] = abs(data['θ']) - 90
-        data['θ'] = np.deg2rad(data['θ'])
-    
-    return data.dropna(subset=['θ'])
+    """
+    Lee el archivo crudo y lo limpia (saltos de tracking, cuadros o campos vacíos).
+    La limpieza reemplaza el filtro de mediana y el offset que se usaban para el archivo mini.
+    """
+    data, calidad = limpiar_corrida(cargar_crudo(file))
+    if calidad['calidad'] < calidad_minima:
+        print(f"Atención: calidad {calidad['calidad']:.2f} en {file}")
+    return data
 
 def modelo_pendulo(t, A, phi, w):
     """Modelo teórico del péndulo simple con w ajustable."""
     return A * np.sin(w * t + phi)
 
+@perfilado.medir('ajuste')
 def fit_pendulum_model(t, theta):
     """
     Ajusta los datos al modelo teórico con mejor manejo de ruido y
@@ -63,12 +49,14 @@ def fit_pendulum_model(t, theta):
     bounds = ([0, -2*np.pi, w_min], [np.inf, 2*np.pi, w_max])
     
     try:
-        popt, pcov = curve_fit(modelo_pendulo, t, theta, 
+        popt, pcov, info, _, _ = curve_fit(modelo_pendulo, t, theta, 
                              p0=[A_guess, phi_guess, w_guess],
                              bounds=bounds,
                              maxfev=10000,
                              method='trf',  # Trust Region Reflective algorithm
-                             loss='soft_l1')  # Más robusto contra outliers
+                             loss='soft_l1',  # Más robusto contra outliers
+                             full_output=True)
+        perfilado.anotar(nfev=info['nfev'])
         
         A, phi, w = popt
         
@@ -84,6 +72,7 @@ def fit_pendulum_model(t, theta):
         print(f"Error en el ajuste: {e}")
         return A_guess, phi_guess, w_guess
 
+@perfilado.medir('estimacion')
 def estimate_initial_parameters(t, theta):
     """
     Estima los parámetros iniciales con mejor manejo de ruido.
@@ -115,6 +104,7 @@ def estimate_initial_parameters(t, theta):
     
     return abs(A), phi
 
+@perfilado.medir('error_relativo')
 def calculate_relative_error(data):
     """
     Calcula el error relativo acumulado entre los datos y el modelo,
@@ -132,7 +122,7 @@ def calculate_relative_error(data):
     
     error_mean = np.mean(error_rel)
     
-    return error_mean, A, w_ajustado
+    return error_mean, A, phi, w_ajustado
 
 def plot_all():
     plt.figure(figsize=(12, 8))
@@ -147,7 +137,9 @@ def plot_all():
         print(f"\nArchivo: {file}")
         print(f"Rango de ángulos: [{data['θ'].min():.2f}, {data['θ'].max():.2f}] rad")
         
-        error, amplitude, w_ajustado = calculate_relative_error(data)
+        #un solo ajuste por archivo: se reutilizan los parámetros para graficar
+        error, A, phi, w_ajustado = calculate_relative_error(data)
+        amplitude = A
         initial_angles.append(abs(amplitude))
         errors.append(error)
         freqs_ajustadas.append(w_ajustado)
@@ -156,7 +148,6 @@ def plot_all():
         t = data['t'].values
         theta_exp = data['θ'].values
         
-        A, phi, w_ajustado = fit_pendulum_model(t, theta_exp)
         theta_modelo = modelo_pendulo(t, A, phi, w_ajustado)
         
         plt.plot(t, theta_exp, 'b.', label='Experimental', alpha=0.5)
@@ -166,7 +157,8 @@ def plot_all():
         plt.title(f'Amplitud: {A:.2f} rad')
         plt.legend()
     
-    plt.tight_layout()
+    with perfilado.etapa('grafico.layout'):
+        plt.tight_layout()
     plt.show()
     plt.figure(figsize=(6, 6))
     initial_angles = np.array(initial_angles)
@@ -0,0 +1,376 @@
+import glob
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from scipy.stats import linregress
+import perfilado
+from amplitud import longitud_de_archivo
+from ciclos import segmentar_ciclos
+from limpieza import calidad_minima, cargar_crudo, limpiar_corrida
+from remuestreo import regularizar
+
+# Servidor local para explorar las corridas sin volver a correr los scripts.
+# Cada corrida se procesa una vez (carga, limpieza, remuestreo, ciclos) y el
+# resultado queda en memoria; un hilo revisa periódicamente la fecha y el tamaño
+# de los archivos y reprocesa solo los que cambiaron, aparecieron o se borraron.
+# Las respuestas que dependen de todas las corridas (lista, ajuste de g) se arman
+# una vez por cambio y se sirven ya serializadas.
+#
+#   python servidor.py       ->   http://localhost:8000
+#
+# Endpoints (JSON):
+#   /api/version                           número que cambia cada vez que cambian las corridas
+#   /api/corridas                          resumen de cada corrida
+#   /api/trayectoria?archivo=...&puntos=N  θ(t) diezmado a ~N puntos (máx/mín por bloque)
+#   /api/ciclos?archivo=...                tabla por ciclo
+#   /api/g                                 ajuste T² vs L y g estimada
+
+patron = 'exp*_L*_*.txt'
+puerto = 8000
+intervalo = 2.0          # segundos entre revisiones de los archivos
+puntos_por_defecto = 1000
+amplitud_maxima_g = 0.35  # rad; por debajo T/T0 < 1.008, el ajuste de g usa solo esos ciclos
+
+
+def _limpiar_json(valor):
+    """Reemplaza NaN/inf por None (JSON no los admite) y pasa tipos de NumPy a Python."""
+    if isinstance(valor, dict):
+        return {k: _limpiar_json(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_limpiar_json(v) for v in valor]
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def _json(valor):
+    return json.dumps(_limpiar_json(valor), ensure_ascii=False).encode('utf-8')
+
+
+def _firma(file):
+    st = os.stat(file)
+    return st.st_mtime_ns, st.st_size
+
+
+def decimar(t, theta, puntos):
+    """
+    Reduce θ(t) a ~`puntos` muestras conservando el máximo y el mínimo de cada
+    bloque, así los picos se siguen viendo al graficar corridas largas.
+    """
+    n = len(t)
+    if n <= puntos or puntos < 2:
+        return t, theta
+    tam = int(np.ceil(n / (puntos // 2)))
+    n_bloques = n // tam
+    bloques = theta[:n_bloques * tam].reshape(n_bloques, tam)
+    base = np.arange(n_bloques) * tam
+    #los bloques sin ningún dato (huecos largos) dejan una sola muestra NaN para cortar la línea
+    vacios = np.isnan(bloques).all(axis=1)
+    con_dato = bloques[~vacios]
+    idx = np.concatenate((base[~vacios] + np.nanargmin(con_dato, axis=1),
+                          base[~vacios] + np.nanargmax(con_dato, axis=1),
+                          base[vacios], np.arange(n_bloques * tam, n)))
+    idx = np.unique(idx)
+    return t[idx], theta[idx]
+
+
+@perfilado.medir('servidor.corrida')
+def procesar_corrida(file):
+    """Procesa un archivo completo. No usa los caches por nombre porque el archivo puede haber cambiado."""
+    data, calidad = limpiar_corrida(cargar_crudo(file))
+    uniforme = regularizar(data)
+    t = uniforme['t'].to_numpy()
+    theta = uniforme['θ'].to_numpy()
+    tabla = segmentar_ciclos(t, theta)
+
+    resumen = {
+        'archivo': file,
+        'longitud': longitud_de_archivo(file),
+        'muestras': len(t),
+        'dt': uniforme.attrs['dt'],
+        'calidad': calidad['calidad'],
+        'ciclos': len(tabla),
+        'periodo': tabla.periodo_medio(),
+        'amplitud': float(np.max(tabla.amplitud)) if len(tabla) else None,
+        'amortiguamiento': tabla.amortiguamiento(),
+    }
+    return {'resumen': resumen, 'limpieza': calidad, 't': t, 'θ': theta, 'ciclos': tabla}
+
+
+def ajustar_g(corridas):
+    """
+    Ajuste lineal T² vs L con un punto por ciclo de pequeña amplitud (< amplitud_maxima_g)
+    de las corridas de calidad suficiente; g = 4π² / pendiente.
+    """
+    longitudes, periodos, usadas = [], [], 0
+    for corrida in corridas:
+        resumen, tabla = corrida['resumen'], corrida['ciclos']
+        if not resumen['longitud'] or resumen['calidad'] < calidad_minima or len(tabla) == 0:
+            continue
+        tabla = tabla.sin_atipicos()
+        tabla = tabla.filtrar(tabla.amplitud < amplitud_maxima_g)
+        if len(tabla) == 0:
+            continue
+        usadas += 1
+        longitudes.append(np.full(len(tabla), resumen['longitud']))
+        periodos.append(tabla.periodo)
+
+    if len(set(np.concatenate(longitudes).tolist() if longitudes else [])) < 2:
+        return {'corridas': usadas, 'g': None}
+    longitudes = np.concatenate(longitudes)
+    periodos_cuadrados = np.concatenate(periodos) ** 2
+    ajuste = linregress(longitudes, periodos_cuadrados)
+    g = 4 * np.pi ** 2 / ajuste.slope
+    return {
+        'corridas': usadas,
+        'ciclos': len(longitudes),
+        'amplitud_maxima': amplitud_maxima_g,
+        'pendiente': ajuste.slope,
+        'ordenada': ajuste.intercept,
+        'r2': ajuste.rvalue ** 2,
+        'g': g,
+        'incerteza_g': g * ajuste.stderr / abs(ajuste.slope),
+        'longitudes': longitudes.tolist(),
+        'periodos_cuadrados': periodos_cuadrados.tolist(),
+    }
+
+
+class Catalogo:
+    """Resultados por corrida en memoria, actualizados de forma incremental."""
+
+    def __init__(self, patron=patron):
+        self.patron = patron
+        self._lock = threading.Lock()
+        self._corridas = {}   # archivo -> resultado de procesar_corrida
+        self._firmas = {}     # archivo -> (mtime_ns, tamaño) con que se procesó
+        self._errores = {}    # archivo -> mensaje
+        self._lista = _json([])
+        self._g = _json({'corridas': 0, 'g': None})
+        self._version = 0     # aumenta con cada cambio; la página vuelve a pedir todo solo si cambió
+
+    def actualizar(self):
+        """Reprocesa solo los archivos nuevos o modificados y quita los borrados. Devuelve cuántos cambiaron."""
+        firmas = {}
+        for file in glob.glob(self.patron):
+            try:
+                firmas[file] = _firma(file)
+            except OSError:
+                continue
+
+        cambiados = [f for f, firma in firmas.items() if self._firmas.get(f) != firma]
+        borrados = [f for f in self._firmas if f not in firmas]
+        if not cambiados and not borrados:
+            return 0
+
+        nuevos, errores = {}, {}
+        for file in cambiados:
+            try:
+                nuevos[file] = procesar_corrida(file)
+            except Exception as e:  # un archivo roto no tiene que tirar el servidor
+                errores[file] = str(e)
+
+        with self._lock:
+            for file in borrados:
+                self._corridas.pop(file, None)
+                self._errores.pop(file, None)
+                self._firmas.pop(file, None)
+            for file in cambiados:
+                self._firmas[file] = firmas[file]
+                if file in nuevos:
+                    self._corridas[file] = nuevos[file]
+                    self._errores.pop(file, None)
+                else:
+                    self._corridas.pop(file, None)
+                    self._errores[file] = errores[file]
+
+            resumenes = [self._corridas[f]['resumen'] for f in sorted(self._corridas)]
+            lista = resumenes + [{'archivo': f, 'error': e} for f, e in sorted(self._errores.items())]
+            self._lista = _json(lista)
+            self._g = _json(ajustar_g(self._corridas[f] for f in sorted(self._corridas)))
+            self._version += 1
+        return len(cambiados) + len(borrados)
+
+    def vigilar(self, intervalo=intervalo):
+        """Arranca un hilo que llama a actualizar() cada `intervalo` segundos."""
+        def bucle():
+            while True:
+                time.sleep(intervalo)
+                n = self.actualizar()
+                if n:
+                    print(f"{n} corrida(s) actualizada(s)")
+        hilo = threading.Thread(target=bucle, daemon=True)
+        hilo.start()
+        return hilo
+
+    def version(self):
+        return _json({'version': self._version})
+
+    def lista(self):
+        return self._lista
+
+    def g(self):
+        return self._g
+
+    def corrida(self, file):
+        with self._lock:
+            return self._corridas.get(file)
+
+
+_PAGINA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Péndulo - corridas</title>
+<style>
+body { font-family: sans-serif; margin: 1em; }
+table { border-collapse: collapse; font-size: 13px; }
+td, th { padding: 2px 8px; border-bottom: 1px solid #ddd; text-align: right; }
+tr:hover { background: #eef; cursor: pointer; }
+#contenido { display: flex; gap: 2em; }
+</style></head>
+<body>
+<h2>Corridas</h2>
+<p id="g"></p>
+<div id="contenido">
+<div style="max-height: 85vh; overflow: auto"><table id="tabla"></table></div>
+<div><h3 id="titulo"></h3><canvas id="grafico" width="800" height="400"></canvas></div>
+</div>
+<script>
+const fmt = (x, d) => (x === null || x === undefined) ? '' : (typeof x === 'number' ? x.toFixed(d) : x);
+
+async function cargar() {
+  const corridas = await (await fetch('/api/corridas')).json();
+  const g = await (await fetch('/api/g')).json();
+  document.getElementById('g').textContent = g.g === null ? 'g: sin datos suficientes'
+    : `g = ${fmt(g.g, 2)} ± ${fmt(g.incerteza_g, 2)} m/s² (${g.ciclos} ciclos con A < ${g.amplitud_maxima} rad de ${g.corridas} corridas, R² = ${fmt(g.r2, 4)})`;
+  const tabla = document.getElementById('tabla');
+  tabla.replaceChildren();
+  const fila = (celdas, etiqueta) => {
+    const tr = tabla.insertRow();
+    for (const valor of celdas) {
+      const td = document.createElement(etiqueta);
+      td.textContent = valor;
+      tr.appendChild(td);
+    }
+    return tr;
+  };
+  fila(['Archivo', 'L (m)', 'Muestras', 'Calidad', 'Ciclos', 'T (s)', 'A (rad)', 'γ (1/s)'], 'th');
+  for (const c of corridas) {
+    if (c.error) {
+      const tr = fila([c.archivo, c.error], 'td');
+      tr.cells[1].colSpan = 7;
+      continue;
+    }
+    const tr = fila([c.archivo, fmt(c.longitud, 3), c.muestras, fmt(c.calidad, 2), c.ciclos,
+                     fmt(c.periodo, 3), fmt(c.amplitud, 3), fmt(c.amortiguamiento, 4)], 'td');
+    tr.onclick = () => graficar(c.archivo);
+  }
+}
+
+async function graficar(archivo) {
+  const canvas = document.getElementById('grafico');
+  const datos = await (await fetch(`/api/trayectoria?archivo=${encodeURIComponent(archivo)}&puntos=${canvas.width}`)).json();
+  document.getElementById('titulo').textContent = archivo;
+  const ctx = canvas.getContext('2d');
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const t = datos.t, y = datos['θ'];
+  if (!t.length) return;
+  const t0 = t[0], t1 = t[t.length - 1];
+  const conDato = y.filter(v => v !== null);  //los huecos largos llegan como null
+  const ymin = Math.min(...conDato), ymax = Math.max(...conDato);
+  const X = v => (v - t0) / (t1 - t0 || 1) * canvas.width;
+  const Y = v => canvas.height - (v - ymin) / (ymax - ymin || 1) * canvas.height;
+  ctx.beginPath();
+  let cortado = true;
+  for (let i = 0; i < t.length; i++) {
+    if (y[i] === null) { cortado = true; continue; }
+    if (cortado) ctx.moveTo(X(t[i]), Y(y[i])); else ctx.lineTo(X(t[i]), Y(y[i]));
+    cortado = false;
+  }
+  ctx.strokeStyle = 'blue';
+  ctx.stroke();
+}
+
+//se consulta solo el número de versión; la lista y g se piden y la tabla se arma
+//de nuevo únicamente cuando cambió alguna corrida
+let version = null;
+async function revisar() {
+  const actual = (await (await fetch('/api/version')).json()).version;
+  if (actual === version) return;
+  version = actual;
+  await cargar();
+}
+
+revisar();
+setInterval(revisar, 5000);
+</script></body></html>
+"""
+
+
+class Manejador(BaseHTTPRequestHandler):
+    catalogo = None
+
+    def _responder(self, cuerpo, tipo='application/json', estado=200):
+        self.send_response(estado)
+        self.send_header('Content-Type', f'{tipo}; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _error(self, estado, mensaje):
+        self._responder(_json({'error': mensaje}), estado=estado)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parametros = parse_qs(url.query)
+
+        if url.path == '/':
+            return self._responder(_PAGINA.encode('utf-8'), tipo='text/html')
+        if url.path == '/api/version':
+            return self._responder(self.catalogo.version())
+        if url.path == '/api/corridas':
+            return self._responder(self.catalogo.lista())
+        if url.path == '/api/g':
+            return self._responder(self.catalogo.g())
+        if url.path in ('/api/trayectoria', '/api/ciclos'):
+            archivo = parametros.get('archivo', [None])[0]
+            corrida = self.catalogo.corrida(archivo)
+            if corrida is None:
+                return self._error(404, f'Corrida desconocida: {archivo}')
+            if url.path == '/api/ciclos':
+                tabla = corrida['ciclos'].a_dataframe()
+                return self._responder(_json(tabla.to_dict(orient='list')))
+            try:
+                puntos = int(parametros.get('puntos', [puntos_por_defecto])[0])
+            except ValueError:
+                return self._error(400, 'puntos tiene que ser un entero')
+            t, theta = decimar(corrida['t'], corrida['θ'], puntos)
+            return self._responder(_json({'t': t.tolist(), 'θ': theta.tolist()}))
+        self._error(404, f'No existe {url.path}')
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def main():
+    catalogo = Catalogo()
+    print("Procesando corridas...")
+    n = catalogo.actualizar()
+    print(f"{n} corridas cargadas")
+    catalogo.vigilar()
+
+    Manejador.catalogo = catalogo
+    servidor = ThreadingHTTPServer(('localhost', puerto), Manejador)
+    print(f"Sirviendo en http://localhost:{puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
+
+if __name__ == '__main__':
+    main()